@@ -0,0 +1,19 @@
+# Production server config:
+#   cd backend/app && gunicorn main:app -c gunicorn.conf.py
+# For local development use `python main.py` (single uvicorn process with reload).
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+worker_class = "uvicorn_worker.UvicornWorker"
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
+
+# Workers import the app themselves after the fork; the only work done in the
+# master is the one-off database setup below
+preload_app = False
+
+def on_starting(server):
+    # Migrate once in the master before any worker boots, so workers don't queue
+    # on the write lock behind a long migration; their own init_db() is then a no-op
+    from models.database import init_db
+    init_db()
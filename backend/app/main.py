@@ -1,42 +1,60 @@
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, Request, BackgroundTasks
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.responses import Response, ORJSONResponse
+from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any
+from contextlib import asynccontextmanager
 import uvicorn
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 from models.triage_model import TriageModel
-from models.database import get_db, Patient, Assessment
+from models.database import get_db, init_db, SessionLocal, Patient, Assessment
 from utils.logging import logger
 from utils.health import router as health_router
 from datetime import datetime
 import os
 from dotenv import load_dotenv
-import json
-import logging
-import models
+import orjson
+import hashlib
+import redis.asyncio as aioredis
 
 # Load environment variables
 load_dotenv()
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('logs/app.log'),
-        logging.StreamHandler()
-    ]
-)
-logger = logging.getLogger('triage_ai')
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Create or migrate the schema before serving, whatever launched the app;
+    # init_db() holds the SQLite write lock, so concurrent workers are safe
+    init_db()
+    
+    # Initialize the triage model once per worker, after any fork
+    app.state.triage_model = TriageModel()
+    
+    # Optional prediction cache shared by all workers. Short timeouts: an
+    # unreachable Redis must cost a lookup miss, not a stalled request
+    redis_url = os.getenv("REDIS_URL")
+    app.state.redis = aioredis.from_url(
+        redis_url,
+        socket_timeout=REDIS_TIMEOUT,
+        socket_connect_timeout=REDIS_TIMEOUT
+    ) if redis_url else None
+    yield
+    if app.state.redis is not None:
+        await app.state.redis.aclose()
 
 app = FastAPI(
     title="TriageAI API",
     description="AI-powered triage assistant for emergency responders",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
-# Initialize the triage model
-triage_model = TriageModel()
+def get_triage_model(request: Request) -> TriageModel:
+    return request.app.state.triage_model
+
+def get_redis(request: Request) -> Optional[aioredis.Redis]:
+    return request.app.state.redis
 
 # Configure CORS
 allowed_origins = [
@@ -64,8 +82,13 @@ class Symptom(BaseModel):
     severity: int  # 1-5 scale
     description: Optional[str] = None
 
+def _symptom_to_dict(s: Symptom) -> Dict[str, Any]:
+    # Plain attribute access; cheaper than model_dump for this fixed 3-field model
+    return {"name": s.name, "severity": s.severity, "description": s.description}
+
 class TriageRequest(BaseModel):
-    symptoms: List[Symptom]
+    # Scoring averages over the symptoms, so an empty list is a client error (422)
+    symptoms: List[Symptom] = Field(min_length=1)
     patient_age: int
     patient_gender: str
     mechanism_of_injury: str
@@ -76,7 +99,8 @@ class TriageResponse(BaseModel):
     recommended_actions: List[str]
     estimated_time_to_treatment: str
     confidence_score: float
-    assessment_factors: dict
+    factors: dict
+    location_recommendations: Optional[Dict[str, Any]] = None
 
 class AssessmentHistory(BaseModel):
     id: int
@@ -86,127 +110,229 @@ class AssessmentHistory(BaseModel):
     created_at: datetime
     symptoms: List[dict]
 
+# Common symptoms catalog, serialized once since it never changes
+SYMPTOMS_CATALOG = (
+    # Critical Symptoms
+    {"name": "Unconsciousness", "severity": 5, "description": "Patient is unresponsive or not alert"},
+    {"name": "Severe Bleeding", "severity": 5, "description": "Uncontrolled or significant bleeding"},
+    {"name": "Chest Pain", "severity": 5, "description": "Severe chest pain or pressure, especially with shortness of breath"},
+    {"name": "Difficulty Breathing", "severity": 5, "description": "Severe shortness of breath or respiratory distress"},
+    {"name": "Stroke Symptoms", "severity": 5, "description": "Sudden weakness, numbness, speech difficulty, or facial drooping"},
+    {"name": "Cardiac Arrest", "severity": 5, "description": "No pulse or breathing"},
+    {"name": "Severe Burns", "severity": 5, "description": "Large or deep burns, especially on face, hands, or genitals"},
+    {"name": "Severe Allergic Reaction", "severity": 5, "description": "Anaphylaxis with breathing difficulty or swelling"},
+    {"name": "Severe Head Injury", "severity": 5, "description": "Head trauma with loss of consciousness or confusion"},
+    {"name": "Multiple Injuries", "severity": 5, "description": "Multiple significant injuries from trauma"},
+
+    # Urgent Symptoms
+    {"name": "Moderate Bleeding", "severity": 4, "description": "Controlled but significant bleeding"},
+    {"name": "Severe Pain", "severity": 4, "description": "Intense pain in any part of the body"},
+    {"name": "Severe Abdominal Pain", "severity": 4, "description": "Intense abdominal pain with nausea or vomiting"},
+    {"name": "Moderate Burns", "severity": 4, "description": "Moderate burns on body parts"},
+    {"name": "Moderate Allergic Reaction", "severity": 4, "description": "Significant allergic reaction with swelling or rash"},
+    {"name": "Moderate Head Injury", "severity": 4, "description": "Head injury with confusion or memory loss"},
+    {"name": "Severe Dehydration", "severity": 4, "description": "Significant dehydration with dizziness or confusion"},
+    {"name": "Severe Nausea/Vomiting", "severity": 4, "description": "Persistent vomiting with dehydration risk"},
+    {"name": "Severe Dizziness", "severity": 4, "description": "Severe dizziness with difficulty standing"},
+    {"name": "Severe Anxiety/Panic", "severity": 4, "description": "Severe anxiety with physical symptoms"},
+
+    # Semi-urgent Symptoms
+    {"name": "Mild Bleeding", "severity": 3, "description": "Minor bleeding that can be controlled"},
+    {"name": "Moderate Pain", "severity": 3, "description": "Significant but manageable pain"},
+    {"name": "Moderate Abdominal Pain", "severity": 3, "description": "Significant abdominal discomfort"},
+    {"name": "Mild Burns", "severity": 3, "description": "Minor burns or sunburns"},
+    {"name": "Mild Allergic Reaction", "severity": 3, "description": "Minor allergic reaction with rash"},
+    {"name": "Mild Head Injury", "severity": 3, "description": "Minor head injury without loss of consciousness"},
+    {"name": "Moderate Dehydration", "severity": 3, "description": "Significant thirst with mild dizziness"},
+    {"name": "Moderate Nausea", "severity": 3, "description": "Persistent nausea without severe vomiting"},
+    {"name": "Moderate Dizziness", "severity": 3, "description": "Significant dizziness but can stand"},
+    {"name": "Moderate Anxiety", "severity": 3, "description": "Significant anxiety with some physical symptoms"},
+
+    # Non-urgent Symptoms
+    {"name": "Minor Pain", "severity": 2, "description": "Mild pain that doesn't interfere with daily activities"},
+    {"name": "Minor Cuts/Scrapes", "severity": 2, "description": "Small cuts or scrapes that can be cleaned at home"},
+    {"name": "Mild Fever", "severity": 2, "description": "Low-grade fever without other severe symptoms"},
+    {"name": "Mild Cough", "severity": 2, "description": "Minor cough without breathing difficulty"},
+    {"name": "Mild Rash", "severity": 2, "description": "Minor skin irritation or rash"},
+    {"name": "Mild Headache", "severity": 2, "description": "Minor headache without other symptoms"},
+    {"name": "Mild Dehydration", "severity": 2, "description": "Slight thirst without dizziness"},
+    {"name": "Mild Nausea", "severity": 2, "description": "Slight nausea without vomiting"},
+    {"name": "Mild Dizziness", "severity": 2, "description": "Slight dizziness without falling risk"},
+    {"name": "Mild Anxiety", "severity": 2, "description": "Minor anxiety without physical symptoms"}
+)
+_SYMPTOMS_JSON = orjson.dumps({"symptoms": SYMPTOMS_CATALOG})
+
 @app.get("/")
 async def root():
     return {"message": "Welcome to TriageAI API"}
 
 @app.get("/triage/symptoms")
 async def get_common_symptoms():
-    try:
-        symptoms = [
-            # Critical Symptoms
-            {"name": "Unconsciousness", "severity": 5, "description": "Patient is unresponsive or not alert"},
-            {"name": "Severe Bleeding", "severity": 5, "description": "Uncontrolled or significant bleeding"},
-            {"name": "Chest Pain", "severity": 5, "description": "Severe chest pain or pressure, especially with shortness of breath"},
-            {"name": "Difficulty Breathing", "severity": 5, "description": "Severe shortness of breath or respiratory distress"},
-            {"name": "Stroke Symptoms", "severity": 5, "description": "Sudden weakness, numbness, speech difficulty, or facial drooping"},
-            {"name": "Cardiac Arrest", "severity": 5, "description": "No pulse or breathing"},
-            {"name": "Severe Burns", "severity": 5, "description": "Large or deep burns, especially on face, hands, or genitals"},
-            {"name": "Severe Allergic Reaction", "severity": 5, "description": "Anaphylaxis with breathing difficulty or swelling"},
-            {"name": "Severe Head Injury", "severity": 5, "description": "Head trauma with loss of consciousness or confusion"},
-            {"name": "Multiple Injuries", "severity": 5, "description": "Multiple significant injuries from trauma"},
-
-            # Urgent Symptoms
-            {"name": "Moderate Bleeding", "severity": 4, "description": "Controlled but significant bleeding"},
-            {"name": "Severe Pain", "severity": 4, "description": "Intense pain in any part of the body"},
-            {"name": "Severe Abdominal Pain", "severity": 4, "description": "Intense abdominal pain with nausea or vomiting"},
-            {"name": "Moderate Burns", "severity": 4, "description": "Moderate burns on body parts"},
-            {"name": "Moderate Allergic Reaction", "severity": 4, "description": "Significant allergic reaction with swelling or rash"},
-            {"name": "Moderate Head Injury", "severity": 4, "description": "Head injury with confusion or memory loss"},
-            {"name": "Severe Dehydration", "severity": 4, "description": "Significant dehydration with dizziness or confusion"},
-            {"name": "Severe Nausea/Vomiting", "severity": 4, "description": "Persistent vomiting with dehydration risk"},
-            {"name": "Severe Dizziness", "severity": 4, "description": "Severe dizziness with difficulty standing"},
-            {"name": "Severe Anxiety/Panic", "severity": 4, "description": "Severe anxiety with physical symptoms"},
-
-            # Semi-urgent Symptoms
-            {"name": "Mild Bleeding", "severity": 3, "description": "Minor bleeding that can be controlled"},
-            {"name": "Moderate Pain", "severity": 3, "description": "Significant but manageable pain"},
-            {"name": "Moderate Abdominal Pain", "severity": 3, "description": "Significant abdominal discomfort"},
-            {"name": "Mild Burns", "severity": 3, "description": "Minor burns or sunburns"},
-            {"name": "Mild Allergic Reaction", "severity": 3, "description": "Minor allergic reaction with rash"},
-            {"name": "Mild Head Injury", "severity": 3, "description": "Minor head injury without loss of consciousness"},
-            {"name": "Moderate Dehydration", "severity": 3, "description": "Significant thirst with mild dizziness"},
-            {"name": "Moderate Nausea", "severity": 3, "description": "Persistent nausea without severe vomiting"},
-            {"name": "Moderate Dizziness", "severity": 3, "description": "Significant dizziness but can stand"},
-            {"name": "Moderate Anxiety", "severity": 3, "description": "Significant anxiety with some physical symptoms"},
-
-            # Non-urgent Symptoms
-            {"name": "Minor Pain", "severity": 2, "description": "Mild pain that doesn't interfere with daily activities"},
-            {"name": "Minor Cuts/Scrapes", "severity": 2, "description": "Small cuts or scrapes that can be cleaned at home"},
-            {"name": "Mild Fever", "severity": 2, "description": "Low-grade fever without other severe symptoms"},
-            {"name": "Mild Cough", "severity": 2, "description": "Minor cough without breathing difficulty"},
-            {"name": "Mild Rash", "severity": 2, "description": "Minor skin irritation or rash"},
-            {"name": "Mild Headache", "severity": 2, "description": "Minor headache without other symptoms"},
-            {"name": "Mild Dehydration", "severity": 2, "description": "Slight thirst without dizziness"},
-            {"name": "Mild Nausea", "severity": 2, "description": "Slight nausea without vomiting"},
-            {"name": "Mild Dizziness", "severity": 2, "description": "Slight dizziness without falling risk"},
-            {"name": "Mild Anxiety", "severity": 2, "description": "Minor anxiety without physical symptoms"}
-        ]
-        logger.info("Successfully retrieved symptoms list")
-        return {"symptoms": symptoms}
-    except Exception as e:
-        logger.error(f"Error retrieving symptoms: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    return Response(content=_SYMPTOMS_JSON, media_type="application/json")
+
+# Seconds a cached assessment stays valid in Redis
+ASSESSMENT_CACHE_TTL = 300
+
+# Seconds to wait on Redis (connect or reply) before treating the cache as unavailable
+REDIS_TIMEOUT = 0.2
+
+# Most patients accepted by one /triage/assess/batch call
+MAX_BATCH_SIZE = 100
 
 @app.post("/triage/validate-cause")
-async def validate_injury_cause(request: Dict[str, str]):
-    """Validate the cause of injury/illness"""
+async def validate_injury_cause(request: Dict[str, str], detailed: bool = False,
+                                triage_model: TriageModel = Depends(get_triage_model)):
+    """Validate the cause of injury/illness; pass ?detailed=true for the matched causes"""
     try:
         cause = request.get("cause", "")
-        validation_result = triage_model.validate_injury_cause(cause)
+        # Results are cached inside the model, keyed on the normalized cause
+        validation_result = triage_model.validate_injury_cause(cause, detailed=detailed)
         return validation_result
     except Exception as e:
         logger.error(f"Error validating cause: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to validate cause")
 
-@app.post("/triage/assess")
-async def assess_triage(request: TriageRequest, db: Session = Depends(get_db)):
+# The prediction dict is returned as-is; TriageResponse only documents its shape
+@app.post("/triage/assess", response_model=None, responses={200: {"model": TriageResponse}})
+async def assess_triage(request: TriageRequest, background_tasks: BackgroundTasks,
+                        triage_model: TriageModel = Depends(get_triage_model),
+                        redis: Optional[aioredis.Redis] = Depends(get_redis)):
     """Perform a comprehensive triage assessment"""
     try:
         logger.info(f"Processing triage assessment for patient age {request.patient_age}")
         
-        # Get base assessment
-        assessment = triage_model.predict(
-            request.symptoms,
-            request.patient_age,
-            request.patient_gender
-        )
-        
-        # Add location-based recommendations if available
-        if request.location:
-            location_recommendations = get_location_recommendations(request.location)
-            assessment["location_recommendations"] = location_recommendations
+        cache_key = _assessment_cache_key(request) if redis is not None else None
+        assessment = await _get_cached_assessment(redis, cache_key) if cache_key else None
         
-        # Create patient first
-        patient = Patient(
-            age=request.patient_age,
-            gender=request.patient_gender
-        )
-        db.add(patient)
-        db.commit()
-        db.refresh(patient)
+        if assessment is None:
+            # Get base assessment
+            assessment = triage_model.predict(
+                request.symptoms,
+                request.patient_age,
+                request.patient_gender
+            )
+            
+            # Add location-based recommendations if available
+            if request.location:
+                location_recommendations = get_location_recommendations(request.location)
+                assessment["location_recommendations"] = location_recommendations
+            
+            # Stored after the response is sent, so a slow Redis never delays it
+            if cache_key:
+                background_tasks.add_task(_cache_assessment, redis, cache_key, assessment)
         
-        # Save assessment to database
-        db_assessment = Assessment(
-            patient_id=patient.id,
-            mechanism_of_injury=request.mechanism_of_injury,
-            symptoms=json.dumps([s.dict() for s in request.symptoms]),
-            severity_level=assessment["severity_level"],
-            recommended_actions=json.dumps(assessment["recommended_actions"]),
-            estimated_time_to_treatment=assessment["estimated_time_to_treatment"],
-            confidence_score=int(assessment["confidence_score"] * 100),
-            created_at=datetime.utcnow()
+        # Persist after the response is sent; sync tasks run in the threadpool
+        background_tasks.add_task(
+            _persist_assessment,
+            request,
+            assessment,
+            assessment["recommended_actions"],
+            datetime.utcnow()
         )
-        db.add(db_assessment)
-        db.commit()
-        db.refresh(db_assessment)
         
-        logger.info(f"Assessment saved to database with severity level: {assessment['severity_level']}")
         return assessment
     except Exception as e:
         logger.error(f"Error processing assessment: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to process assessment")
 
+@app.post("/triage/assess/batch", response_model=None, responses={200: {"model": List[TriageResponse]}})
+async def assess_triage_batch(requests: List[TriageRequest], background_tasks: BackgroundTasks,
+                              triage_model: TriageModel = Depends(get_triage_model)):
+    """Assess several patients in one call (e.g. mass-casualty intake)"""
+    if len(requests) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=413, detail=f"At most {MAX_BATCH_SIZE} patients per batch")
+    
+    try:
+        logger.info(f"Processing batch triage assessment for {len(requests)} patients")
+        
+        # Off the event loop: the first batch in a worker also JIT-compiles the kernel
+        assessments = await run_in_threadpool(triage_model.predict_batch, [
+            (request.symptoms, request.patient_age, request.patient_gender)
+            for request in requests
+        ])
+        
+        for request, assessment in zip(requests, assessments):
+            if request.location:
+                assessment["location_recommendations"] = get_location_recommendations(request.location)
+        
+        # The whole batch is saved in one transaction
+        background_tasks.add_task(_persist_assessments, requests, assessments, datetime.utcnow())
+        
+        return assessments
+    except Exception as e:
+        logger.error(f"Error processing batch assessment: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to process batch assessment")
+
+def _assessment_cache_key(request: TriageRequest) -> str:
+    """Hash the fields that determine the assessment (everything but the cause text)"""
+    payload = orjson.dumps(
+        request.model_dump(mode="json", exclude={"mechanism_of_injury"}),
+        option=orjson.OPT_SORT_KEYS
+    )
+    return "triage:assess:" + hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+async def _get_cached_assessment(redis: aioredis.Redis, key: str) -> Optional[Dict[str, Any]]:
+    # The cache is an optimization only; fall back to predicting if Redis is down
+    try:
+        cached = await redis.get(key)
+    except Exception as e:
+        logger.warning(f"Assessment cache lookup failed: {str(e)}")
+        return None
+    return orjson.loads(cached) if cached is not None else None
+
+async def _cache_assessment(redis: aioredis.Redis, key: str, assessment: Dict[str, Any]) -> None:
+    try:
+        await redis.set(key, orjson.dumps(assessment), ex=ASSESSMENT_CACHE_TTL)
+    except Exception as e:
+        logger.warning(f"Assessment cache store failed: {str(e)}")
+
+def _add_assessment(db: Session, request: TriageRequest, prediction: Dict[str, Any],
+                    actions: List[str], time: datetime) -> None:
+    """Stage the patient and assessment records on `db`"""
+    patient = Patient(
+        age=request.patient_age,
+        gender=request.patient_gender
+    )
+    # The relationship fills in patient_id when the session flushes
+    db.add(Assessment(
+        patient=patient,
+        mechanism_of_injury=request.mechanism_of_injury,
+        symptoms=[_symptom_to_dict(s) for s in request.symptoms],
+        severity_level=prediction["severity_level"],
+        recommended_actions=actions,
+        estimated_time_to_treatment=prediction["estimated_time_to_treatment"],
+        confidence_score=prediction["confidence_score"],
+        created_at=time
+    ))
+
+def _persist_assessment(request: TriageRequest, prediction: Dict[str, Any],
+                        actions: List[str], time: datetime) -> None:
+    """Save the patient and assessment records (background task)"""
+    # The request-scoped session is closed by now, so use a dedicated one
+    db = SessionLocal()
+    try:
+        with db.begin():
+            _add_assessment(db, request, prediction, actions, time)
+        logger.info(f"Assessment saved to database with severity level: {prediction['severity_level']}")
+    except Exception as e:
+        logger.error(f"Error saving assessment: {str(e)}")
+    finally:
+        db.close()
+
+def _persist_assessments(requests: List[TriageRequest], predictions: List[Dict[str, Any]],
+                         time: datetime) -> None:
+    """Save a whole batch of assessments in one session and transaction (background task)"""
+    db = SessionLocal()
+    try:
+        with db.begin():
+            for request, prediction in zip(requests, predictions):
+                _add_assessment(db, request, prediction, prediction["recommended_actions"], time)
+        logger.info(f"Saved batch of {len(requests)} assessments to database")
+    except Exception as e:
+        logger.error(f"Error saving batch assessment: {str(e)}")
+    finally:
+        db.close()
+
 def get_location_recommendations(location: Dict[str, float]) -> Dict[str, Any]:
     """Get location-based recommendations"""
     recommendations = {
@@ -233,7 +359,13 @@ def get_location_recommendations(location: Dict[str, float]) -> Dict[str, Any]:
 @app.get("/triage/history", response_model=List[AssessmentHistory])
 async def get_assessment_history(db: Session = Depends(get_db)):
     try:
-        assessments = db.query(Assessment).order_by(Assessment.created_at.desc()).limit(10).all()
+        assessments = (
+            db.query(Assessment)
+            .options(joinedload(Assessment.patient))
+            .order_by(Assessment.created_at.desc())
+            .limit(10)
+            .all()
+        )
         return [
             AssessmentHistory(
                 id=assessment.id,
@@ -250,4 +382,5 @@ async def get_assessment_history(db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=str(e))
 
 if __name__ == "__main__":
-    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True) 
\ No newline at end of file
+    # Development server; production runs gunicorn with gunicorn.conf.py
+    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True, loop="uvloop", http="httptools") 
\ No newline at end of file
@@ -1,6 +1,7 @@
-from sqlalchemy import create_engine, Column, Integer, String, DateTime, JSON, ForeignKey
+from sqlalchemy import create_engine, event, text, Column, Integer, Float, String, DateTime, JSON, ForeignKey, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
+from sqlalchemy.pool import QueuePool
 from datetime import datetime
 
 Base = declarative_base()
@@ -24,18 +25,96 @@ class Assessment(Base):
     severity_level = Column(String)
     recommended_actions = Column(JSON)
     estimated_time_to_treatment = Column(String)
-    confidence_score = Column(Integer)
+    confidence_score = Column(Float)  # 0-1
     created_at = Column(DateTime, default=datetime.utcnow)
     
     patient = relationship("Patient", back_populates="assessments")
 
+# History is always read newest-first
+ix_assessment_created_at = Index("ix_assessment_created_at", Assessment.created_at.desc())
+
 # Create database engine
 SQLALCHEMY_DATABASE_URL = "sqlite:///./triage.db"
-engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+engine = create_engine(
+    SQLALCHEMY_DATABASE_URL,
+    connect_args={"check_same_thread": False},
+    poolclass=QueuePool,
+    pool_size=20,
+    max_overflow=40,
+    pool_pre_ping=True,
+    pool_recycle=3600
+)
+
+@event.listens_for(engine, "connect")
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    # WAL lets readers proceed while a write is in progress
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA mmap_size=268435456")
+    cursor.close()
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
-# Create tables
-Base.metadata.create_all(bind=engine)
+# Bump when adding a one-off migration to init_db(); stored in PRAGMA user_version
+SCHEMA_VERSION = 1
+
+def migrate_confidence_scores(conn):
+    # Older databases declare confidence_score INTEGER and hold integer percentages
+    # (87, or 1 for 1%). That affinity also turns whole-number floats back into
+    # integers, so rebuild the table with the Float column and rescale on copy.
+    columns = {row[1]: row[2] for row in conn.exec_driver_sql("PRAGMA table_info(assessments)")}
+    if columns.get("confidence_score", "").upper() != "INTEGER":
+        return
+    
+    # The index moves with a renamed table, so drop it before create() re-adds it
+    conn.exec_driver_sql("DROP INDEX IF EXISTS ix_assessment_created_at")
+    conn.exec_driver_sql("ALTER TABLE assessments RENAME TO assessments_old")
+    Assessment.__table__.create(bind=conn)
+    names = [column.name for column in Assessment.__table__.columns]
+    selected = [
+        "CASE WHEN typeof(confidence_score) = 'integer' THEN confidence_score / 100.0 "
+        "ELSE confidence_score END" if name == "confidence_score" else name
+        for name in names
+    ]
+    conn.exec_driver_sql(
+        f"INSERT INTO assessments ({', '.join(names)}) "
+        f"SELECT {', '.join(selected)} FROM assessments_old"
+    )
+    conn.exec_driver_sql("DROP TABLE assessments_old")
+
+def migrate_double_encoded_json(conn):
+    # Older rows were json.dumps()'d before hitting the JSON column, so they hold a JSON string
+    for column in ("symptoms", "recommended_actions"):
+        conn.execute(text(
+            f"UPDATE assessments SET {column} = json_extract({column}, '$') "
+            f"WHERE json_type({column}) = 'text'"
+        ))
+
+def init_db():
+    """
+    Create tables and run data migrations. Called from the app lifespan (and once
+    more in gunicorn's master, see gunicorn.conf.py), never on import. Safe to run
+    from several processes at once: the whole setup holds the SQLite write lock.
+    """
+    with engine.begin() as conn:
+        # pysqlite doesn't open a transaction before DDL, so take the write lock
+        # explicitly; setup then commits or rolls back as a whole
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+        Base.metadata.create_all(bind=conn)
+        
+        # create_all skips tables that already exist, so older databases get the index here
+        ix_assessment_created_at.create(bind=conn, checkfirst=True)
+        
+        # One-off migrations run once per database, not on every start
+        if conn.exec_driver_sql("PRAGMA user_version").scalar() < 1:
+            migrate_confidence_scores(conn)
+            migrate_double_encoded_json(conn)
+            conn.exec_driver_sql(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    
+    # Don't hand pooled connections down to forked workers
+    engine.dispose()
 
 def get_db():
     db = SessionLocal()
@@ -1,16 +1,148 @@
 import numpy as np
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.preprocessing import StandardScaler
-from typing import List, Dict, Any
+import ahocorasick
+try:
+    import hyperscan
+except ImportError:  # Linux x86-64 only; fall back to Aho-Corasick elsewhere
+    hyperscan = None
+from typing import List, Dict, Any, Tuple
+from collections import Counter
+from itertools import chain
+from types import MappingProxyType
+from functools import lru_cache
 import logging
+import re
 
 logger = logging.getLogger(__name__)
 
+# Indexed by severity_idx, least to most severe
+SEVERITY_LEVELS = ("Non-urgent", "Semi-urgent", "Urgent", "Critical")
+
+_GENDER_MAP = MappingProxyType({"male": 0, "female": 1, "other": 2})
+
+# Base recommendations per severity level, shared read-only across calls
+_ACTIONS = MappingProxyType({
+    "Critical": (
+        "Immediate life support measures",
+        "Prepare for emergency transport",
+        "Alert receiving facility",
+        "Continuous vital signs monitoring",
+        "Establish IV access",
+        "Prepare emergency medications",
+        "Document all interventions"
+    ),
+    "Urgent": (
+        "Rapid assessment and stabilization",
+        "Prepare for urgent transport",
+        "Monitor vital signs every 5 minutes",
+        "Establish IV access",
+        "Administer oxygen if needed",
+        "Prepare emergency medications",
+        "Document all interventions"
+    ),
+    "Semi-urgent": (
+        "Comprehensive assessment",
+        "Prepare for non-emergency transport",
+        "Monitor vital signs every 15 minutes",
+        "Administer medications as needed",
+        "Provide comfort measures",
+        "Document all interventions"
+    ),
+    "Non-urgent": (
+        "Complete assessment",
+        "Schedule follow-up care",
+        "Provide self-care instructions",
+        "Monitor for changes",
+        "Document assessment"
+    )
+})
+
+_TIMES = MappingProxyType({
+    "Critical": "Immediate (within 5 minutes)",
+    "Urgent": "Within 15 minutes",
+    "Semi-urgent": "Within 30 minutes",
+    "Non-urgent": "Within 2 hours"
+})
+
+def _score_kernel(sev, lens, pattern_adj, risk_adj, n_correlated):
+    """Severity scoring over a zero-padded (cases, symptoms) matrix, for numba to compile"""
+    n_cases = sev.shape[0]
+    severity_idx = np.empty(n_cases, dtype=np.int64)
+    confidence_score = np.empty(n_cases)
+    avg_severity = np.empty(n_cases)
+    adjusted_severity = np.empty(n_cases)
+    for row in range(n_cases):
+        count = lens[row]
+        total = 0.0
+        critical = False
+        for col in range(count):
+            total += sev[row, col]
+            if sev[row, col] == 5:
+                critical = True
+        avg = total / count
+        adjusted = avg * pattern_adj[row] * risk_adj[row]
+        
+        if adjusted >= 4.5 or critical:
+            idx = 3
+        elif adjusted >= 3.5 or (adjusted >= 3.0 and count >= 2):
+            idx = 2
+        elif adjusted >= 2.5 or (adjusted >= 2.0 and count >= 2):
+            idx = 1
+        else:
+            idx = 0
+        
+        variance = 0.0
+        for col in range(count):
+            diff = sev[row, col] - avg
+            variance += diff * diff
+        variance /= count
+        symptom_count_factor = min(count / 3.0, 1.0)
+        pattern_confidence = n_correlated[row] / 5.0 if n_correlated[row] > 0 else 0.5
+        
+        severity_idx[row] = idx
+        confidence_score[row] = (1.0 - (variance / 4.0)) * (0.6 + 0.2 * symptom_count_factor + 0.2 * pattern_confidence)
+        avg_severity[row] = avg
+        adjusted_severity[row] = adjusted
+    return severity_idx, confidence_score, avg_severity, adjusted_severity
+
+@lru_cache(maxsize=None)
+def _score_batch():
+    """
+    The compiled _score_kernel, built on the first batch prediction so numba stays
+    off the import and startup path. Compiled code is cached on disk across
+    restarts. fastmath is left off so reassociated float math can't move a case
+    across a severity threshold.
+    """
+    from numba import njit
+    return njit(cache=True)(_score_kernel)
+
 class TriageModel:
+    # Nonsense causes, fused into one pattern and used with match() (anchored at the
+    # start): just numbers, 1-2 letters, only symbols, or a common test input prefix
+    _INVALID_CAUSE_PATTERN = re.compile(r'[0-9]+$|[a-z]{1,2}$|[^a-z0-9\s]+$|test|asdf|qwerty|123|abc$')
+    
+    # Fallback keywords when no known cause phrase matches; checked in this order
+    _CAUSE_KEYWORDS = {
+        'accidents': ('accident', 'fell', 'fall', 'hit', 'struck', 'crash', 'collision', 'burn', 'cut', 'wound'),
+        'medical_conditions': ('pain', 'ache', 'fever', 'sick', 'illness', 'infection', 'attack', 'seizure', 'allergy')
+    }
+    
+    # predict()'s headline action and treatment window, indexed by severity_idx
+    _ACTIONS_BY_IDX = (
+        ("Monitor symptoms and seek care if needed",),
+        ("Seek medical attention within 2 hours",),
+        ("Seek immediate medical attention",),
+        ("Call emergency services immediately",)
+    )
+    _TTT_BY_IDX = (
+        "Non-urgent (within 24 hours)",
+        "Semi-urgent (within 2 hours)",
+        "Urgent (within 30 minutes)",
+        "Immediate (within 15 minutes)"
+    )
+    
     def __init__(self):
-        self.model = RandomForestClassifier(n_estimators=100, random_state=42)
-        self.scaler = StandardScaler()
-        self.severity_levels = ["Non-urgent", "Semi-urgent", "Urgent", "Critical"]
+        self._model = None
+        self._scaler = None
         self.symptom_categories = {
             'vital_signs': ['Heart Rate', 'Blood Pressure', 'Temperature', 'Oxygen Saturation'],
             'neurological': ['Unconsciousness', 'Confusion', 'Seizure', 'Stroke Symptoms'],
@@ -21,6 +153,11 @@ class TriageModel:
             'allergic': ['Allergic Reaction', 'Anaphylaxis', 'Swelling', 'Rash'],
             'mental_health': ['Anxiety', 'Panic Attack', 'Depression', 'Suicidal Thoughts']
         }
+        # Reverse index; a symptom can sit in several categories ('Chest Pain')
+        self._symptom_to_categories = {}
+        for category, category_symptoms in self.symptom_categories.items():
+            for name in category_symptoms:
+                self._symptom_to_categories[name] = self._symptom_to_categories.get(name, ()) + (category,)
         self.symptom_correlations = {
             'chest_pain': ['difficulty_breathing', 'heart_attack', 'anxiety'],
             'difficulty_breathing': ['chest_pain', 'asthma', 'allergic_reaction'],
@@ -69,11 +206,64 @@ class TriageModel:
                 'overdose', 'drug overdose', 'substance abuse'
             ]
         }
+        # Flat phrase -> category index; phrases listed under both categories
+        # (e.g. 'overdose') keep the first, matching the accidents-first check
+        self._phrase_category = {}
+        for category, phrases in self.common_injury_causes.items():
+            for phrase in phrases:
+                self._phrase_category.setdefault(phrase, category)
+        self._cause_phrases = list(self._phrase_category)
+        
+        # A cause phrase matches when any of its words occurs in the input, so one
+        # multi-pattern scan over all phrase words finds every matching phrase
+        word_phrases = {}
+        for idx, phrase in enumerate(self._cause_phrases):
+            for word in phrase.split():
+                word_phrases.setdefault(word, []).append(idx)
+        cause_words = list(word_phrases)
+        self._cause_word_phrases = [tuple(word_phrases[word]) for word in cause_words]
+        
+        self._cause_hyperscan = None
+        self._cause_automaton = None
+        if hyperscan is not None:
+            self._cause_hyperscan = hyperscan.Database()
+            self._cause_hyperscan.compile(
+                expressions=[re.escape(word).encode() for word in cause_words],
+                ids=list(range(len(cause_words))),
+                flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH] * len(cause_words)
+            )
+        else:
+            self._cause_automaton = ahocorasick.Automaton()
+            for word_idx, word in enumerate(cause_words):
+                self._cause_automaton.add_word(word, word_idx)
+            self._cause_automaton.make_automaton()
+        
+        # Same single-pass lookup for the fallback keywords, keyed to category order
+        self._keyword_categories = list(self._CAUSE_KEYWORDS)
+        self._keyword_automaton = ahocorasick.Automaton()
+        for category_idx, category in enumerate(self._keyword_categories):
+            for word in self._CAUSE_KEYWORDS[category]:
+                self._keyword_automaton.add_word(word, category_idx)
+        self._keyword_automaton.make_automaton()
+        # Per-instance caches so a re-initialized model starts cold
+        self._score_cached = lru_cache(maxsize=4096)(self._score_uncached)
+        self._validate_cause_cached = lru_cache(maxsize=4096)(self._validate_cause_frozen)
+    
+    def _ensure_model(self):
+        """
+        Build the ML estimators on first use. predict() is rule-based and never
+        calls this, so sklearn stays off the import and startup path.
+        """
+        if self._model is None:
+            from sklearn.ensemble import RandomForestClassifier
+            from sklearn.preprocessing import StandardScaler
+            self._model = RandomForestClassifier(n_estimators=100, random_state=42)
+            self._scaler = StandardScaler()
+        return self._model, self._scaler
         
     def _prepare_features(self, symptoms, patient_age, patient_gender):
         # Convert gender to numeric
-        gender_map = {"male": 0, "female": 1, "other": 2}
-        gender_encoded = gender_map.get(patient_gender.lower(), 2)
+        gender_encoded = _GENDER_MAP.get(patient_gender.lower(), 2)
         
         # Create feature vector
         features = [patient_age, gender_encoded]
@@ -86,10 +276,11 @@ class TriageModel:
         features.extend(symptom_severities)
         return np.array(features).reshape(1, -1)
     
-    def validate_injury_cause(self, cause: str) -> Dict[str, Any]:
+    def validate_injury_cause(self, cause: str, detailed: bool = False) -> Dict[str, Any]:
         """
         Validate and categorize the injury cause.
-        Returns a dictionary with validation results and suggestions.
+        Returns a dictionary with validation results and suggestions; the
+        matched 'causes' list is only included when `detailed` is set.
         """
         if not cause:
             return {
@@ -98,8 +289,43 @@ class TriageModel:
                 'suggestions': ['Tell us what happened', 'What caused the injury or illness?']
             }
 
-        cause = cause.lower().strip()
-        
+        # Normalize once here; the matchers below are built for lowercase input
+        frozen = self._validate_cause_cached(cause.lower().strip(), detailed)
+        # Rebuild fresh lists so callers can't mutate the cached result
+        return {key: list(value) if isinstance(value, tuple) else value for key, value in frozen}
+    
+    def _validate_cause_frozen(self, cause, detailed):
+        """Hashable form of _validate_cause_uncached's result, for the LRU cache"""
+        result = self._validate_cause_uncached(cause, detailed)
+        return tuple((key, tuple(value) if isinstance(value, list) else value) for key, value in result.items())
+    
+    def _is_accident_word(self, word_idx):
+        return any(self._phrase_category[self._cause_phrases[idx]] == 'accidents'
+                   for idx in self._cause_word_phrases[word_idx])
+    
+    def _match_cause_phrases(self, cause, stop_on_accident=False):
+        """
+        Indices of the cause phrases that have a word occurring in `cause`.
+        With `stop_on_accident` the scan ends at the first accident phrase,
+        since that alone settles the category.
+        """
+        matched_phrases = set()
+        if self._cause_hyperscan is not None:
+            def on_match(word_idx, start, end, flags, context):
+                matched_phrases.update(self._cause_word_phrases[word_idx])
+                return stop_on_accident and self._is_accident_word(word_idx)
+            try:
+                self._cause_hyperscan.scan(cause.encode(), match_event_handler=on_match)
+            except hyperscan.ScanTerminated:
+                pass
+        else:
+            for _, word_idx in self._cause_automaton.iter(cause):
+                matched_phrases.update(self._cause_word_phrases[word_idx])
+                if stop_on_accident and self._is_accident_word(word_idx):
+                    break
+        return matched_phrases
+    
+    def _validate_cause_uncached(self, cause, detailed=False):
         # Check if the cause is too short
         if len(cause) < 3:
             return {
@@ -109,45 +335,25 @@ class TriageModel:
             }
 
         # Check for common injury causes with fuzzy matching
-        found_causes = []
-        for category, causes in self.common_injury_causes.items():
-            for valid_cause in causes:
-                # Check if any word from the valid cause is in the user's input
-                valid_words = valid_cause.split()
-                if any(word in cause for word in valid_words):
-                    found_causes.append(valid_cause)
+        matched_phrases = self._match_cause_phrases(cause, stop_on_accident=not detailed)
 
-        if not found_causes:
+        if not matched_phrases:
             # If no exact matches found, try to categorize based on keywords
-            keywords = {
-                'accidents': ['accident', 'fell', 'fall', 'hit', 'struck', 'crash', 'collision', 'burn', 'cut', 'wound'],
-                'medical_conditions': ['pain', 'ache', 'fever', 'sick', 'illness', 'infection', 'attack', 'seizure', 'allergy']
-            }
-            
-            matched_category = None
-            for category, words in keywords.items():
-                if any(word in cause for word in words):
-                    matched_category = category
-                    break
+            keyword_hits = [category_idx for _, category_idx in self._keyword_automaton.iter(cause)]
+            matched_category = self._keyword_categories[min(keyword_hits)] if keyword_hits else None
 
             if matched_category:
-                return {
+                result = {
                     'is_valid': True,
                     'message': 'Valid cause of injury/illness identified.',
-                    'causes': [cause],
                     'category': matched_category
                 }
+                if detailed:
+                    result['causes'] = [cause]
+                return result
 
             # If no category matches, check for invalid or nonsensical input
-            invalid_patterns = [
-                r'^[0-9]+$',  # Just numbers
-                r'^[a-z]{1,2}$',  # Single or double letters
-                r'^[^a-z0-9\s]+$',  # No letters or numbers
-                r'^test|testing|asdf|qwerty|123|abc$',  # Common test inputs
-            ]
-            
-            import re
-            if any(re.match(pattern, cause) for pattern in invalid_patterns):
+            if self._INVALID_CAUSE_PATTERN.match(cause):
                 return {
                     'is_valid': False,
                     'message': 'Please provide a meaningful description of what happened.',
@@ -159,19 +365,25 @@ class TriageModel:
                 }
 
             # If we get here, the input is reasonable but not matching our categories
-            return {
+            result = {
                 'is_valid': True,
                 'message': 'Cause of injury/illness recorded.',
-                'causes': [cause],
                 'category': 'other'
             }
+            if detailed:
+                result['causes'] = [cause]
+            return result
 
-        return {
+        # Phrase indices are already unique; sorting keeps the catalog order
+        found_causes = [self._cause_phrases[idx] for idx in sorted(matched_phrases)]
+        result = {
             'is_valid': True,
             'message': 'Valid cause of injury/illness identified.',
-            'causes': found_causes,
-            'category': 'accidents' if any(cause in self.common_injury_causes['accidents'] for cause in found_causes) else 'medical_conditions'
+            'category': 'accidents' if any(self._phrase_category[phrase] == 'accidents' for phrase in found_causes) else 'medical_conditions'
         }
+        if detailed:
+            result['causes'] = found_causes
+        return result
     
     def analyze_symptom_patterns(self, symptoms, patient_age, patient_gender):
         """Analyze symptom patterns and correlations"""
@@ -182,17 +394,15 @@ class TriageModel:
             'progression_indicators': []
         }
         
-        # Analyze symptom categories
-        for symptom in symptoms:
-            for category, category_symptoms in self.symptom_categories.items():
-                if symptom.name in category_symptoms:
-                    patterns['category_distribution'][category] = patterns['category_distribution'].get(category, 0) + 1
+        # Analyze symptom categories; one lookup per symptom, counted in a single pass
+        patterns['category_distribution'] = dict(Counter(chain.from_iterable(
+            self._symptom_to_categories.get(symptom.name, ()) for symptom in symptoms
+        )))
         
         # Find correlated symptoms
-        for symptom in symptoms:
-            symptom_key = symptom.name.lower().replace(' ', '_')
-            if symptom_key in self.symptom_correlations:
-                patterns['correlated_symptoms'].extend(self.symptom_correlations[symptom_key])
+        patterns['correlated_symptoms'] = list(chain.from_iterable(
+            self.symptom_correlations.get(self._symptom_key(symptom.name), ()) for symptom in symptoms
+        ))
         
         # Analyze risk factors
         if patient_age < 1:
@@ -202,109 +412,137 @@ class TriageModel:
         
         return patterns
     
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _symptom_key(name):
+        """'Chest Pain' -> 'chest_pain', the form symptom_correlations is keyed by"""
+        return name.lower().replace(' ', '_')
+    
     def predict(self, symptoms, patient_age, patient_gender):
-        features = self._prepare_features(symptoms, patient_age, patient_gender)
-        
-        # Calculate total severity and average severity
-        total_severity = sum(s.severity for s in symptoms)
-        avg_severity = total_severity / len(symptoms)
-        
-        # Analyze symptom patterns
+        # Patterns follow the request's symptom order, so only the scoring is cached;
+        # the response is built fresh each call and callers may add keys to it
         patterns = self.analyze_symptom_patterns(symptoms, patient_age, patient_gender)
-        
-        # Calculate severity adjustments based on patterns
-        pattern_adjustment = 1.0
-        if len(patterns['correlated_symptoms']) > 0:
-            pattern_adjustment *= 1.2  # Increase severity for correlated symptoms
-        
-        # Apply risk factor adjustments
-        risk_adjustment = 1.0
-        for risk_type, risk_value in patterns['risk_factors']:
-            if risk_type in self.risk_factors:
-                risk_adjustment *= self.risk_factors[risk_type][risk_value]['weight']
+        pattern_adjustment, risk_adjustment = self._severity_adjustments(patterns)
+        severity_idx, confidence_score, avg_severity, adjusted_severity = self._score_cached(
+            tuple(s.severity for s in symptoms),
+            pattern_adjustment,
+            risk_adjustment,
+            len(patterns['correlated_symptoms'])
+        )
+        return self._build_prediction(
+            severity_idx, confidence_score, avg_severity,
+            pattern_adjustment, risk_adjustment, adjusted_severity, patterns
+        )
+    
+    @staticmethod
+    def _score_uncached(severities, pattern_adjustment, risk_adjustment, n_correlated):
+        """(severity_idx, confidence_score, avg_severity, adjusted_severity) for one case"""
+        # Every severity statistic below is derived from this one tuple
+        symptom_count = len(severities)
+        total_severity = sum(severities)
+        avg_severity = total_severity / symptom_count
         
         # Calculate final severity
         adjusted_severity = avg_severity * pattern_adjustment * risk_adjustment
         
         # Determine severity level
-        if adjusted_severity >= 4.5 or any(s.severity == 5 for s in symptoms):
+        if adjusted_severity >= 4.5 or 5 in severities:
             severity_idx = 3  # Critical
-        elif adjusted_severity >= 3.5 or (adjusted_severity >= 3.0 and len(symptoms) >= 2):
+        elif adjusted_severity >= 3.5 or (adjusted_severity >= 3.0 and symptom_count >= 2):
             severity_idx = 2  # Urgent
-        elif adjusted_severity >= 2.5 or (adjusted_severity >= 2.0 and len(symptoms) >= 2):
+        elif adjusted_severity >= 2.5 or (adjusted_severity >= 2.0 and symptom_count >= 2):
             severity_idx = 1  # Semi-urgent
         else:
             severity_idx = 0  # Non-urgent
         
         # Calculate confidence score
-        severity_variance = np.var([s.severity for s in symptoms])
+        # Plain arithmetic beats numpy dispatch for a handful of values
+        severity_variance = sum((x - avg_severity) * (x - avg_severity) for x in severities) / symptom_count
         base_confidence = 1.0 - (severity_variance / 4.0)
-        symptom_count_factor = min(len(symptoms) / 3.0, 1.0)
-        pattern_confidence = len(patterns['correlated_symptoms']) / 5.0 if patterns['correlated_symptoms'] else 0.5
+        symptom_count_factor = min(symptom_count / 3.0, 1.0)
+        pattern_confidence = n_correlated / 5.0 if n_correlated else 0.5
         confidence_score = base_confidence * (0.6 + 0.2 * symptom_count_factor + 0.2 * pattern_confidence)
         
+        return severity_idx, confidence_score, avg_severity, adjusted_severity
+    
+    def _build_prediction(self, severity_idx, confidence_score, avg_severity,
+                          pattern_adjustment, risk_adjustment, adjusted_severity, patterns):
+        # All scalars here must already be Python floats, ready for JSON encoding
         return {
-            "severity_level": self.severity_levels[severity_idx],
-            "confidence_score": float(confidence_score),
-            "recommended_actions": [
-                "Call emergency services immediately" if severity_idx == 3 else
-                "Seek immediate medical attention" if severity_idx == 2 else
-                "Seek medical attention within 2 hours" if severity_idx == 1 else
-                "Monitor symptoms and seek care if needed"
-            ],
-            "estimated_time_to_treatment": (
-                "Immediate (within 15 minutes)" if severity_idx == 3 else
-                "Urgent (within 30 minutes)" if severity_idx == 2 else
-                "Semi-urgent (within 2 hours)" if severity_idx == 1 else
-                "Non-urgent (within 24 hours)"
-            ),
+            "severity_level": SEVERITY_LEVELS[severity_idx],
+            "confidence_score": confidence_score,
+            "recommended_actions": list(self._ACTIONS_BY_IDX[severity_idx]),
+            "estimated_time_to_treatment": self._TTT_BY_IDX[severity_idx],
             "factors": {
-                "average_severity": float(avg_severity),
-                "pattern_adjustment": float(pattern_adjustment),
-                "risk_adjustment": float(risk_adjustment),
-                "final_severity": float(adjusted_severity),
+                "average_severity": avg_severity,
+                "pattern_adjustment": pattern_adjustment,
+                "risk_adjustment": risk_adjustment,
+                "final_severity": adjusted_severity,
                 "patterns": patterns
             }
         }
     
-    def get_recommended_actions(self, severity_level, patient_age=None, patterns=None):
-        base_actions = {
-            "Critical": [
-                "Immediate life support measures",
-                "Prepare for emergency transport",
-                "Alert receiving facility",
-                "Continuous vital signs monitoring",
-                "Establish IV access",
-                "Prepare emergency medications",
-                "Document all interventions"
-            ],
-            "Urgent": [
-                "Rapid assessment and stabilization",
-                "Prepare for urgent transport",
-                "Monitor vital signs every 5 minutes",
-                "Establish IV access",
-                "Administer oxygen if needed",
-                "Prepare emergency medications",
-                "Document all interventions"
-            ],
-            "Semi-urgent": [
-                "Comprehensive assessment",
-                "Prepare for non-emergency transport",
-                "Monitor vital signs every 15 minutes",
-                "Administer medications as needed",
-                "Provide comfort measures",
-                "Document all interventions"
-            ],
-            "Non-urgent": [
-                "Complete assessment",
-                "Schedule follow-up care",
-                "Provide self-care instructions",
-                "Monitor for changes",
-                "Document assessment"
-            ]
-        }
+    def _severity_adjustments(self, patterns):
+        # Calculate severity adjustments based on patterns
+        pattern_adjustment = 1.0
+        if len(patterns['correlated_symptoms']) > 0:
+            pattern_adjustment *= 1.2  # Increase severity for correlated symptoms
+        
+        # Apply risk factor adjustments
+        risk_adjustment = 1.0
+        for risk_type, risk_value in patterns['risk_factors']:
+            if risk_type in self.risk_factors:
+                risk_adjustment *= self.risk_factors[risk_type][risk_value]['weight']
+        
+        return pattern_adjustment, risk_adjustment
+    
+    def predict_batch(self, cases: List[Tuple[list, int, str]]) -> List[Dict[str, Any]]:
+        """
+        Predict many (symptoms, patient_age, patient_gender) cases at once.
+        Same results as predict(); the severity math runs once over the whole batch.
+        """
+        n_cases = len(cases)
+        if n_cases == 0:
+            return []
+        if any(not symptoms for symptoms, _, _ in cases):
+            raise ValueError("Each case needs at least one symptom")
+        
+        # Zero-padded severity matrix, one row per case
+        lens = np.array([len(symptoms) for symptoms, _, _ in cases])
+        sev = np.zeros((n_cases, lens.max()))
+        for row, (symptoms, _, _) in enumerate(cases):
+            sev[row, :lens[row]] = [s.severity for s in symptoms]
+        
+        # Pattern analysis is dict work, so it stays per case
+        all_patterns = []
+        pattern_adj = np.empty(n_cases)
+        risk_adj = np.empty(n_cases)
+        n_correlated = np.empty(n_cases)
+        for row, (symptoms, patient_age, patient_gender) in enumerate(cases):
+            patterns = self.analyze_symptom_patterns(symptoms, patient_age, patient_gender)
+            all_patterns.append(patterns)
+            pattern_adj[row], risk_adj[row] = self._severity_adjustments(patterns)
+            n_correlated[row] = len(patterns['correlated_symptoms'])
         
-        actions = base_actions.get(severity_level, [])
+        severity_idx, confidence_score, avg_severity, adjusted_severity = _score_batch()(
+            sev, lens, pattern_adj, risk_adj, n_correlated
+        )
+        
+        # Unbox each array to Python scalars in one C-level tolist() call
+        columns = zip(
+            severity_idx.tolist(),
+            confidence_score.tolist(),
+            avg_severity.tolist(),
+            pattern_adj.tolist(),
+            risk_adj.tolist(),
+            adjusted_severity.tolist(),
+            all_patterns
+        )
+        return [self._build_prediction(*column) for column in columns]
+    
+    def get_recommended_actions(self, severity_level, patient_age=None, patterns=None):
+        # Copy since pattern and age-specific actions are appended below
+        actions = list(_ACTIONS.get(severity_level, ()))
         
         # Add pattern-specific actions
         if patterns:
@@ -333,14 +571,7 @@ class TriageModel:
         return actions
     
     def get_time_to_treatment(self, severity_level, patient_age=None):
-        base_times = {
-            "Critical": "Immediate (within 5 minutes)",
-            "Urgent": "Within 15 minutes",
-            "Semi-urgent": "Within 30 minutes",
-            "Non-urgent": "Within 2 hours"
-        }
-        
-        time = base_times.get(severity_level, "As soon as possible")
+        time = _TIMES.get(severity_level, "As soon as possible")
         
         # Adjust time based on age
         if patient_age is not None:
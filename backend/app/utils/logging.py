@@ -1,9 +1,49 @@
 import logging
 import sys
-from datetime import datetime
+from datetime import date, timedelta
 from typing import Optional
+import glob
 import os
 
+class DailyFileHandler(logging.FileHandler):
+    """
+    Append to <prefix>-YYYYMMDD.log, moving to a new file at midnight and deleting
+    files older than backup_count days. Nothing is ever renamed, so every gunicorn
+    worker can append to the same day's file without clobbering another's output.
+    """
+    
+    def __init__(self, prefix: str, backup_count: int = 14):
+        self.prefix = prefix
+        self.backup_count = backup_count
+        self.day = date.today()
+        super().__init__(self._path(self.day), delay=True)
+        self._prune()
+    
+    def _path(self, day: date) -> str:
+        return f"{self.prefix}-{day:%Y%m%d}.log"
+    
+    def emit(self, record):
+        # Called with the handler lock held
+        day = date.fromtimestamp(record.created)
+        if day > self.day:
+            self.day = day
+            if self.stream is not None:
+                self.stream.close()
+                self.stream = None
+            self.baseFilename = os.path.abspath(self._path(day))
+            self._prune()
+        super().emit(record)
+    
+    def _prune(self):
+        # Fixed-width dates under the same prefix sort chronologically
+        cutoff = self._path(self.day - timedelta(days=self.backup_count))
+        for path in glob.glob(glob.escape(self.prefix) + "-" + "[0-9]" * 8 + ".log"):
+            if path < cutoff:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass  # Another worker pruned it first
+
 def setup_logging(
     log_level: str = "INFO",
     enable_access_logs: bool = True,
@@ -13,22 +53,24 @@ def setup_logging(
     # Create logs directory if it doesn't exist
     os.makedirs('logs', exist_ok=True)
     
-    # Configure basic logging
-    logging.basicConfig(
-        level=getattr(logging, log_level),
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.StreamHandler(sys.stdout),
-            logging.FileHandler(f'logs/app-{datetime.now().strftime("%Y%m%d")}.log')
-        ]
-    )
+    # Configure basic logging; skipped if already configured so no extra file handle is opened.
+    # Every gunicorn worker appends to the same files, so they rotate by date, not by rename
+    if not logging.getLogger().handlers:
+        logging.basicConfig(
+            level=getattr(logging, log_level),
+            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+            handlers=[
+                logging.StreamHandler(sys.stdout),
+                DailyFileHandler('logs/app', backup_count=14)
+            ]
+        )
 
     # Create logger instance
     logger = logging.getLogger("triage_ai")
     
-    # Add access log handler if enabled
-    if enable_access_logs:
-        access_handler = logging.FileHandler(f'logs/access-{datetime.now().strftime("%Y%m%d")}.log')
+    # Add access log handler if enabled (once, even if setup_logging runs again)
+    if enable_access_logs and not logger.handlers:
+        access_handler = DailyFileHandler('logs/access', backup_count=14)
         access_handler.setFormatter(logging.Formatter('%(asctime)s - %(message)s'))
         logger.addHandler(access_handler)
 
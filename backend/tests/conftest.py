@@ -0,0 +1,22 @@
+import os
+import sys
+
+import pytest
+from sqlalchemy import create_engine, event
+
+# The app uses flat imports (models.*, utils.*), as when run from backend/app
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "app"))
+
+@pytest.fixture
+def db_dir(tmp_path, monkeypatch):
+    """Point the app's engine and sessions at an empty triage.db under tmp_path"""
+    from models import database
+    original_engine = database.engine
+    engine = create_engine(f"sqlite:///{tmp_path / 'triage.db'}", connect_args={"check_same_thread": False})
+    event.listen(engine, "connect", database.set_sqlite_pragmas)
+    monkeypatch.setattr(database, "engine", engine)
+    database.SessionLocal.configure(bind=engine)
+    monkeypatch.chdir(tmp_path)
+    yield tmp_path
+    database.SessionLocal.configure(bind=original_engine)
+    engine.dispose()
@@ -0,0 +1,63 @@
+import pytest
+from fastapi.testclient import TestClient
+
+BODY = {
+    "symptoms": [{"name": "Head Injury", "severity": 3}, {"name": "Chest Pain", "severity": 4}],
+    "patient_age": 40,
+    "patient_gender": "female",
+    "mechanism_of_injury": "fall"
+}
+
+@pytest.fixture
+def client(db_dir):
+    import main
+    with TestClient(main.app) as test_client:
+        yield test_client
+
+def test_lifespan_creates_schema_on_fresh_database(client):
+    response = client.post("/triage/assess", json=BODY)
+    assert response.status_code == 200
+    
+    history = client.get("/triage/history")
+    assert history.status_code == 200
+    assert [row["patient_age"] for row in history.json()] == [40]
+
+def test_batch_matches_single_assessment(client):
+    single = client.post("/triage/assess", json=BODY).json()
+    batch = client.post("/triage/assess/batch", json=[BODY, dict(BODY, patient_age=80)])
+    assert batch.status_code == 200
+    assert batch.json()[0] == single
+    assert len(client.get("/triage/history").json()) == 3
+
+@pytest.mark.parametrize("path, payload", [
+    ("/triage/assess", dict(BODY, symptoms=[])),
+    ("/triage/assess/batch", [BODY, dict(BODY, symptoms=[])]),
+])
+def test_empty_symptoms_rejected(client, path, payload):
+    assert client.post(path, json=payload).status_code == 422
+
+def test_oversized_batch_rejected(client):
+    import main
+    response = client.post("/triage/assess/batch", json=[BODY] * (main.MAX_BATCH_SIZE + 1))
+    assert response.status_code == 413
+
+def test_unresponsive_redis_does_not_stall_assessment(db_dir, monkeypatch):
+    # Accepts connections (via the listen backlog) but never answers
+    import socket
+    import time
+    import main
+    
+    server = socket.socket()
+    server.bind(("127.0.0.1", 0))
+    server.listen(8)
+    monkeypatch.setenv("REDIS_URL", f"redis://127.0.0.1:{server.getsockname()[1]}/0")
+    try:
+        with TestClient(main.app) as test_client:
+            start = time.perf_counter()
+            response = test_client.post("/triage/assess", json=BODY)
+            elapsed = time.perf_counter() - start
+    finally:
+        server.close()
+    
+    assert response.status_code == 200
+    assert elapsed < 2.0
@@ -0,0 +1,118 @@
+import json
+import sqlite3
+
+from models.database import init_db, SessionLocal, Patient, Assessment, SCHEMA_VERSION
+
+# Schema as created before confidence_score became a Float column
+LEGACY_SCHEMA = """
+CREATE TABLE patients (
+    id INTEGER NOT NULL,
+    age INTEGER,
+    gender VARCHAR,
+    created_at DATETIME,
+    PRIMARY KEY (id)
+);
+CREATE TABLE assessments (
+    id INTEGER NOT NULL,
+    patient_id INTEGER,
+    symptoms JSON,
+    mechanism_of_injury VARCHAR,
+    severity_level VARCHAR,
+    recommended_actions JSON,
+    estimated_time_to_treatment VARCHAR,
+    confidence_score INTEGER,
+    created_at DATETIME,
+    PRIMARY KEY (id),
+    FOREIGN KEY(patient_id) REFERENCES patients (id)
+);
+"""
+
+def _create_legacy_db(path):
+    conn = sqlite3.connect(path)
+    conn.executescript(LEGACY_SCHEMA)
+    symptoms = [{"name": "Chest Pain", "severity": 4, "description": None}]
+    actions = ["Seek immediate medical attention"]
+    rows = [
+        # (id, confidence_score, symptoms, recommended_actions)
+        (1, 87, json.dumps(symptoms), json.dumps(actions)),
+        (2, 1, json.dumps(symptoms), json.dumps(actions)),
+        (3, 100, json.dumps(symptoms), json.dumps(actions)),
+        # Double-encoded: a JSON string holding the JSON document
+        (4, 75, json.dumps(json.dumps(symptoms)), json.dumps(json.dumps(actions))),
+    ]
+    for row_id, score, symptoms_json, actions_json in rows:
+        conn.execute("INSERT INTO patients (id, age, gender) VALUES (?, 30, 'female')", (row_id,))
+        conn.execute(
+            "INSERT INTO assessments (id, patient_id, symptoms, severity_level, recommended_actions, "
+            "confidence_score, created_at) VALUES (?, ?, ?, 'Urgent', ?, ?, '2024-01-01 00:00:00')",
+            (row_id, row_id, symptoms_json, actions_json, score)
+        )
+    conn.commit()
+    conn.close()
+
+def _scores(path):
+    conn = sqlite3.connect(path)
+    try:
+        return {
+            row_id: (kind, score)
+            for row_id, kind, score in conn.execute(
+                "SELECT id, typeof(confidence_score), confidence_score FROM assessments"
+            )
+        }
+    finally:
+        conn.close()
+
+def _schema_info(path):
+    conn = sqlite3.connect(path)
+    try:
+        column_type = {row[1]: row[2] for row in conn.execute("PRAGMA table_info(assessments)")}["confidence_score"]
+        indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        return column_type, indexes, version
+    finally:
+        conn.close()
+
+def test_init_db_migrates_legacy_database(db_dir):
+    path = db_dir / "triage.db"
+    _create_legacy_db(path)
+    
+    init_db()
+    
+    column_type, indexes, version = _schema_info(path)
+    assert column_type == "FLOAT"
+    assert "ix_assessment_created_at" in indexes
+    assert version == SCHEMA_VERSION == 1
+    assert _scores(path) == {1: ("real", 0.87), 2: ("real", 0.01), 3: ("real", 1.0), 4: ("real", 0.75)}
+    
+    # Double-encoded JSON is unwrapped and rows still load through the ORM
+    db = SessionLocal()
+    try:
+        assessment = db.get(Assessment, 4)
+        assert assessment.symptoms == [{"name": "Chest Pain", "severity": 4, "description": None}]
+        assert assessment.recommended_actions == ["Seek immediate medical attention"]
+        assert assessment.patient.age == 30
+    finally:
+        db.close()
+
+def test_init_db_is_idempotent_and_keeps_new_whole_scores(db_dir):
+    path = db_dir / "triage.db"
+    _create_legacy_db(path)
+    init_db()
+    
+    db = SessionLocal()
+    with db.begin():
+        db.add(Assessment(patient=Patient(age=40, gender="male"), confidence_score=1.0,
+                          symptoms=[], recommended_actions=[]))
+    db.close()
+    
+    init_db()
+    
+    scores = _scores(path)
+    assert scores[5] == ("real", 1.0)
+    assert scores[1] == ("real", 0.87)
+    assert _schema_info(path) == ("FLOAT", {"ix_assessment_created_at"}, 1)
+
+def test_init_db_creates_fresh_database(db_dir):
+    init_db()
+    init_db()
+    assert _schema_info(db_dir / "triage.db") == ("FLOAT", {"ix_assessment_created_at"}, 1)
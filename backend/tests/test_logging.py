@@ -0,0 +1,56 @@
+import logging
+import time
+from datetime import date, timedelta
+
+import pytest
+
+@pytest.fixture
+def log_dir(tmp_path, monkeypatch):
+    # utils.logging opens the app's own log files on import; keep them out of the repo
+    monkeypatch.chdir(tmp_path)
+    directory = tmp_path / "out"
+    directory.mkdir()
+    return directory
+
+def _handler(prefix, **kwargs):
+    from utils.logging import DailyFileHandler
+    return DailyFileHandler(prefix, **kwargs)
+
+def _emit(handler, message, day):
+    record = logging.LogRecord("test", logging.INFO, __file__, 0, message, None, None)
+    record.created = time.mktime(day.timetuple()) + 60
+    handler.handle(record)
+
+def test_switches_file_at_midnight_without_renaming(log_dir):
+    today = date.today()
+    tomorrow = today + timedelta(days=1)
+    # Two handlers on the same prefix stand in for two gunicorn workers
+    workers = [_handler(str(log_dir / "app")), _handler(str(log_dir / "app"))]
+    
+    for index, handler in enumerate(workers):
+        _emit(handler, f"worker {index} today", today)
+    for index, handler in enumerate(workers):
+        _emit(handler, f"worker {index} tomorrow", tomorrow)
+    for handler in workers:
+        handler.close()
+    
+    assert (log_dir / f"app-{today:%Y%m%d}.log").read_text().splitlines() == ["worker 0 today", "worker 1 today"]
+    assert (log_dir / f"app-{tomorrow:%Y%m%d}.log").read_text().splitlines() == ["worker 0 tomorrow", "worker 1 tomorrow"]
+
+def test_prunes_files_older_than_backup_count(log_dir):
+    today = date.today()
+    tomorrow = today + timedelta(days=1)
+    for age in (0, 2, 3, 10):
+        (log_dir / f"app-{today - timedelta(days=age):%Y%m%d}.log").write_text("old\n")
+    (log_dir / "access-20000101.log").write_text("other prefix\n")
+    
+    handler = _handler(str(log_dir / "app"), backup_count=2)
+    _emit(handler, "next day", tomorrow)
+    handler.close()
+    
+    # Only files within backup_count days of the new day survive; other prefixes are untouched
+    assert sorted(path.name for path in log_dir.iterdir()) == [
+        "access-20000101.log",
+        f"app-{today:%Y%m%d}.log",
+        f"app-{tomorrow:%Y%m%d}.log",
+    ]
@@ -0,0 +1,66 @@
+import math
+import random
+from collections import namedtuple
+
+import pytest
+
+from models.triage_model import TriageModel
+
+Symptom = namedtuple("Symptom", ["name", "severity", "description"])
+
+@pytest.fixture(scope="module")
+def model():
+    return TriageModel()
+
+def _assert_close(expected, actual, path="result"):
+    """Exact structure and ordering; floats compared with a tight tolerance"""
+    if isinstance(expected, dict):
+        assert expected.keys() == actual.keys(), path
+        for key in expected:
+            _assert_close(expected[key], actual[key], f"{path}.{key}")
+    elif isinstance(expected, (list, tuple)):
+        assert len(expected) == len(actual), path
+        for index, (left, right) in enumerate(zip(expected, actual)):
+            _assert_close(left, right, f"{path}[{index}]")
+    elif isinstance(expected, float):
+        assert math.isclose(expected, actual, rel_tol=1e-12, abs_tol=1e-12), (path, expected, actual)
+    else:
+        assert expected == actual, (path, expected, actual)
+
+def _random_cases(model, count, seed=0):
+    rng = random.Random(seed)
+    names = sorted({name for names in model.symptom_categories.values() for name in names})
+    names += ["Abdominal Pain", "Mild Fever", "chest pain", "Unknown Symptom"]
+    return [
+        (
+            [Symptom(rng.choice(names), rng.randint(1, 5), None) for _ in range(rng.randint(1, 8))],
+            rng.choice([0, 1, 17, 40, 65, 66, 90]),
+            rng.choice(["male", "Female", "other"])
+        )
+        for _ in range(count)
+    ]
+
+def test_predict_batch_matches_predict(model):
+    cases = _random_cases(model, 500)
+    for case, batch_result in zip(cases, model.predict_batch(cases)):
+        _assert_close(model.predict(*case), batch_result)
+
+def test_correlated_symptoms_follow_request_order(model):
+    symptoms = [Symptom("Head Injury", 3, None), Symptom("Chest Pain", 4, None)]
+    expected = [
+        "unconsciousness", "confusion", "nausea",
+        "difficulty_breathing", "heart_attack", "anxiety"
+    ]
+    assert model.predict(symptoms, 40, "female")["factors"]["patterns"]["correlated_symptoms"] == expected
+    assert model.predict_batch([(symptoms, 40, "female")])[0]["factors"]["patterns"]["correlated_symptoms"] == expected
+
+def test_predict_returns_fresh_dicts(model):
+    symptoms = [Symptom("Chest Pain", 4, None)]
+    first = model.predict(symptoms, 40, "male")
+    first["recommended_actions"].append("mutated")
+    first["factors"]["patterns"]["correlated_symptoms"].clear()
+    assert model.predict(symptoms, 40, "male") != first
+
+def test_predict_batch_rejects_empty_symptoms(model):
+    with pytest.raises(ValueError):
+        model.predict_batch([([], 40, "male")])